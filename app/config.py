@@ -11,6 +11,13 @@ class Settings(BaseSettings):
     snapauth_api_key: str | None = None
     jwt_audience: str | None = None
     jwt_issuer: str | None = None
+    change_feed_history_size: int = 1000
+    change_feed_subscriber_buffer: int = 256
+    change_feed_heartbeat_seconds: float = 15.0
+    profiling_sample_rate: float = 0.0
+    profiling_store_size: int = 50
+    profiling_stats_limit: int = 40
+    profiling_max_seconds: float = 10.0
 
     model_config = {
         "env_prefix": "",
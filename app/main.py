@@ -4,6 +4,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.database import Base, engine
 from app.routers import api_router
 from app.config import get_settings
+from app.services.profiling import ProfilingMiddleware
 
 
 def create_app() -> FastAPI:
@@ -23,6 +24,7 @@ def create_app() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    app.add_middleware(ProfilingMiddleware, settings=settings)
 
     app.include_router(api_router)
     return app
@@ -1,9 +1,10 @@
 from fastapi import APIRouter
-from app.routers import auth, evaluations
+from app.routers import admin, auth, evaluations
 
 api_router = APIRouter()
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
 api_router.include_router(evaluations.router, prefix="/evaluations", tags=["evaluations"])
+api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
 
 __all__ = ["api_router"]
 
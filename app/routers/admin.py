@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from app.dependencies.auth import AuthenticatedUser, require_admin
+from app.schemas.profile import ProfileRead, ProfileSummary
+from app.services.profiling import ProfiledRoute, ProfileStore, get_profile_store
+
+router = APIRouter(route_class=ProfiledRoute)
+
+
+@router.get("/profiles", response_model=list[ProfileSummary])
+def list_profiles(
+    store: ProfileStore = Depends(get_profile_store),
+    auth: AuthenticatedUser = Depends(require_admin),
+):
+    return store.list()
+
+
+@router.get("/profiles/{profile_id}", response_model=ProfileRead)
+def get_profile(
+    profile_id: str,
+    store: ProfileStore = Depends(get_profile_store),
+    auth: AuthenticatedUser = Depends(require_admin),
+):
+    profile = store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    return profile
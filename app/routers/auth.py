@@ -5,6 +5,7 @@ from fastapi.security import HTTPAuthorizationCredentials
 from app.config import Settings, get_settings
 from app.dependencies.auth import AuthenticatedUser, get_current_user, security
 from app.schemas.user import UserCreate, UserLogin, UserRead
+from app.services.profiling import ProfiledRoute
 from app.services.snapauth import SnapAuthClient
 
 
@@ -20,7 +21,7 @@ def get_snapauth_client(settings: Settings = Depends(get_settings)) -> SnapAuthC
     return SnapAuthClient(settings)
 
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 
 @router.post("/register", response_model=dict)
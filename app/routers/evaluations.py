@@ -1,9 +1,12 @@
 import base64
-from typing import Optional
+import time
+from typing import AsyncIterator, Callable, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
+from app.config import Settings, get_settings
 from app.database import get_db
 from app.dependencies.auth import AuthenticatedUser, get_current_user, require_admin
 from app.models import Evaluation
@@ -12,9 +15,15 @@ from app.schemas.evaluation import (
     EvaluationRead,
     EvaluationUpdate,
     EvaluationListResponse,
+    EvaluationChangeEvent,
+    EvaluationChangesResponse,
 )
+from app.services.events import EvaluationEvent, EvaluationEventBus, get_event_bus
+from app.services.profiling import ProfiledRoute
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
+
+FEED_CURSOR_PREFIX = "feed."
 
 
 def _encode_cursor(identifier: int) -> str:
@@ -31,15 +40,98 @@ def _decode_cursor(cursor: Optional[str]) -> Optional[int]:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
 
 
+def _encode_feed_cursor(epoch: str, sequence: int) -> str:
+    return f"{FEED_CURSOR_PREFIX}{epoch}.{sequence}"
+
+
+def _decode_feed_cursor(cursor: Optional[str]) -> Optional[tuple[str, int]]:
+    if not cursor:
+        return None
+    try:
+        prefix, epoch, sequence = cursor.split(".")
+        if f"{prefix}." != FEED_CURSOR_PREFIX or not epoch:
+            raise ValueError(cursor)
+        return epoch, int(sequence)
+    except Exception:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
 def _is_admin(auth: AuthenticatedUser) -> bool:
     return "admin" in auth.roles
 
 
+def _publish_change(bus: EvaluationEventBus, event_type: str, evaluation: Evaluation) -> None:
+    data = EvaluationRead.model_validate(evaluation).model_dump(mode="json")
+    bus.publish(event_type, evaluation.id, evaluation.owner_id, data)
+
+
+def _to_change_event(event: EvaluationEvent, epoch: str) -> EvaluationChangeEvent:
+    return EvaluationChangeEvent(
+        cursor=_encode_feed_cursor(epoch, event.sequence),
+        type=event.type,
+        evaluation_id=event.evaluation_id,
+        data=event.data,
+    )
+
+
+def _format_sse(event_type: str, event_id: str, data: str) -> str:
+    return f"id: {event_id}\nevent: {event_type}\ndata: {data}\n\n"
+
+
+def _visible_to(viewer_id: str, is_admin: bool) -> Optional[Callable[[EvaluationEvent], bool]]:
+    if is_admin:
+        return None
+    return lambda event: event.owner_id == viewer_id
+
+
+async def _stream_changes(
+    request: Request,
+    bus: EvaluationEventBus,
+    after: int,
+    epoch: str,
+    visible: Optional[Callable[[EvaluationEvent], bool]],
+    heartbeat: float,
+    expires_at: Optional[float],
+) -> AsyncIterator[str]:
+    subscription = bus.subscribe(after, epoch, visible)
+    try:
+        while not await request.is_disconnected():
+            timeout = heartbeat
+            if expires_at is not None:
+                # Close once the token expires; the client reconnects with a
+                # fresh token and Last-Event-ID.
+                remaining = expires_at - time.time()
+                if remaining <= 0:
+                    break
+                timeout = min(timeout, remaining)
+            events = await subscription.next_batch(timeout)
+            if subscription.overflowed:
+                # Client fell behind; tell it to re-list and continue from now.
+                bus.unsubscribe(subscription)
+                subscription = bus.subscribe(visible=visible)
+                after = subscription.position
+                yield _format_sse("reset", _encode_feed_cursor(bus.epoch, after), "{}")
+                continue
+            for event in events:
+                change = _to_change_event(event, bus.epoch)
+                yield _format_sse(change.type, change.cursor, change.model_dump_json())
+                after = event.sequence
+            if subscription.position > after:
+                # Move Last-Event-ID past events this client was not shown.
+                after = subscription.position
+                yield f"id: {_encode_feed_cursor(bus.epoch, after)}\n\n"
+            elif not events:
+                yield ": keepalive\n\n"
+    finally:
+        bus.unsubscribe(subscription)
+
+
 @router.post("", response_model=EvaluationRead, status_code=status.HTTP_201_CREATED)
 def create_evaluation(
     payload: EvaluationCreate,
     db: Session = Depends(get_db),
     auth: AuthenticatedUser = Depends(get_current_user),
+    bus: EvaluationEventBus = Depends(get_event_bus),
 ):
     evaluation = Evaluation(
         content=payload.content,
@@ -52,8 +144,10 @@ def create_evaluation(
         owner_id=auth.user.id,
     )
     db.add(evaluation)
-    db.commit()
-    db.refresh(evaluation)
+    with bus.ordered_commit():
+        db.commit()
+        db.refresh(evaluation)
+        _publish_change(bus, "created", evaluation)
     return evaluation
 
 
@@ -79,6 +173,64 @@ def list_evaluations(
     return EvaluationListResponse(items=items, next_cursor=next_cursor, has_more=has_more)
 
 
+@router.get("/changes", response_model=EvaluationChangesResponse)
+async def poll_evaluation_changes(
+    cursor: Optional[str] = Query(None),
+    timeout: float = Query(25.0, ge=0, le=60),
+    auth: AuthenticatedUser = Depends(get_current_user),
+    bus: EvaluationEventBus = Depends(get_event_bus),
+):
+    position = _decode_feed_cursor(cursor)
+    epoch, after = position if position else (bus.epoch, bus.last_sequence)
+    # Take identity from the token: touching the expired auth.user would reopen
+    # a transaction and pin a pooled connection for the whole wait.
+    visible = _visible_to(auth.token["sub"], _is_admin(auth))
+
+    subscription = bus.subscribe(after, epoch, visible)
+    try:
+        events = await subscription.next_batch(timeout)
+    finally:
+        bus.unsubscribe(subscription)
+    if subscription.overflowed:
+        return EvaluationChangesResponse(
+            items=[],
+            next_cursor=_encode_feed_cursor(bus.epoch, bus.last_sequence),
+            reset=True,
+        )
+
+    items = [_to_change_event(event, bus.epoch) for event in events]
+    return EvaluationChangesResponse(
+        items=items, next_cursor=_encode_feed_cursor(bus.epoch, subscription.position)
+    )
+
+
+@router.get("/changes/stream")
+async def stream_evaluation_changes(
+    request: Request,
+    cursor: Optional[str] = Query(None),
+    last_event_id: Optional[str] = Header(None),
+    auth: AuthenticatedUser = Depends(get_current_user),
+    bus: EvaluationEventBus = Depends(get_event_bus),
+    settings: Settings = Depends(get_settings),
+):
+    position = _decode_feed_cursor(last_event_id or cursor)
+    epoch, after = position if position else (bus.epoch, bus.last_sequence)
+    events = _stream_changes(
+        request,
+        bus,
+        after,
+        epoch,
+        visible=_visible_to(auth.token["sub"], _is_admin(auth)),
+        heartbeat=settings.change_feed_heartbeat_seconds,
+        expires_at=auth.token.get("exp"),
+    )
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/{evaluation_id}", response_model=EvaluationRead)
 def get_evaluation(
     evaluation_id: int,
@@ -99,6 +251,7 @@ def update_evaluation(
     payload: EvaluationUpdate,
     db: Session = Depends(get_db),
     auth: AuthenticatedUser = Depends(get_current_user),
+    bus: EvaluationEventBus = Depends(get_event_bus),
 ):
     evaluation = db.get(Evaluation, evaluation_id)
     if evaluation is None:
@@ -110,8 +263,10 @@ def update_evaluation(
     for field, value in update_data.items():
         setattr(evaluation, field, value)
 
-    db.commit()
-    db.refresh(evaluation)
+    with bus.ordered_commit():
+        db.commit()
+        db.refresh(evaluation)
+        _publish_change(bus, "updated", evaluation)
     return evaluation
 
 
@@ -120,10 +275,14 @@ def delete_evaluation(
     evaluation_id: int,
     db: Session = Depends(get_db),
     auth: AuthenticatedUser = Depends(require_admin),
+    bus: EvaluationEventBus = Depends(get_event_bus),
 ):
     evaluation = db.get(Evaluation, evaluation_id)
     if evaluation is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Evaluation not found")
+    evaluation_id, owner_id = evaluation.id, evaluation.owner_id
     db.delete(evaluation)
-    db.commit()
+    with bus.ordered_commit():
+        db.commit()
+        bus.publish("deleted", evaluation_id, owner_id)
     return None
@@ -4,7 +4,10 @@ from app.schemas.evaluation import (
     EvaluationUpdate,
     EvaluationRead,
     EvaluationListResponse,
+    EvaluationChangeEvent,
+    EvaluationChangesResponse,
 )
+from app.schemas.profile import ProfileStatement, ProfileSummary, ProfileRead
 
 __all__ = [
     "UserCreate",
@@ -14,5 +17,10 @@ __all__ = [
     "EvaluationUpdate",
     "EvaluationRead",
     "EvaluationListResponse",
+    "EvaluationChangeEvent",
+    "EvaluationChangesResponse",
+    "ProfileStatement",
+    "ProfileSummary",
+    "ProfileRead",
 ]
 
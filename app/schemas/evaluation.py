@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import Literal
 from pydantic import BaseModel, ConfigDict, Field, field_validator, conint
 
 
@@ -58,3 +59,15 @@ class EvaluationListResponse(BaseModel):
     next_cursor: str | None
     has_more: bool
 
+
+class EvaluationChangeEvent(BaseModel):
+    cursor: str
+    type: Literal["created", "updated", "deleted"]
+    evaluation_id: int
+    data: EvaluationRead | None = None
+
+
+class EvaluationChangesResponse(BaseModel):
+    items: list[EvaluationChangeEvent]
+    next_cursor: str
+    reset: bool = False
@@ -0,0 +1,31 @@
+from datetime import datetime
+from typing import Literal
+from pydantic import BaseModel, ConfigDict
+
+
+class ProfileStatement(BaseModel):
+    statement: str
+    duration_ms: float
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ProfileSummary(BaseModel):
+    id: str
+    method: str
+    path: str
+    trigger: Literal["header", "sampled"]
+    status_code: int | None = None
+    started_at: datetime
+    duration_ms: float
+    db_time_ms: float
+    db_statement_count: int
+    serialization_ms: float
+    truncated: bool
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ProfileRead(ProfileSummary):
+    statements: list[ProfileStatement]
+    stats: str
@@ -0,0 +1,184 @@
+import asyncio
+import threading
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Iterator
+
+from app.config import get_settings
+
+
+@dataclass(frozen=True)
+class EvaluationEvent:
+    sequence: int
+    type: str
+    evaluation_id: int
+    owner_id: str
+    data: dict[str, Any] | None = None
+
+
+class EventSubscription:
+    """Bounded buffer of events delivered to a single change-feed client.
+
+    ``visible`` filters events before they are buffered, so only events the
+    client may see count toward ``max_buffer``. ``position`` is the highest
+    sequence the client has been brought up to, filtered events included.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        max_buffer: int,
+        position: int,
+        visible: Callable[[EvaluationEvent], bool] | None = None,
+    ):
+        self._loop = loop
+        self._max_buffer = max_buffer
+        self._visible = visible
+        self._lock = threading.Lock()
+        self._pending: deque[EvaluationEvent] = deque()
+        self._replayed = 0
+        self._seen = position
+        self._wakeup = asyncio.Event()
+        self.position = position
+        self.overflowed = False
+
+    def _push(self, event: EvaluationEvent, replay: bool = False) -> None:
+        with self._lock:
+            if self.overflowed:
+                return
+            self._seen = event.sequence
+            if self._visible is not None and not self._visible(event):
+                return
+            if replay:
+                # Replayed history is bounded by the bus, not the live buffer.
+                self._replayed += 1
+            elif len(self._pending) - self._replayed >= self._max_buffer:
+                # Slow consumer: drop the buffer and let the client resync.
+                self._pending.clear()
+                self.overflowed = True
+                self._notify()
+                return
+            self._pending.append(event)
+        self._notify()
+
+    def _notify(self) -> None:
+        try:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+        except RuntimeError:  # pragma: no cover - loop already closed
+            pass
+
+    async def next_batch(self, timeout: float) -> list[EvaluationEvent]:
+        """Wait up to ``timeout`` seconds and return whatever has been buffered."""
+        deadline = self._loop.time() + timeout
+        while not self._pending and not self.overflowed:
+            # Wakeups can be stale (set after a previous drain), so re-check.
+            self._wakeup.clear()
+            remaining = deadline - self._loop.time()
+            if remaining <= 0:
+                break
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), remaining)
+            except asyncio.TimeoutError:
+                break
+        with self._lock:
+            events = list(self._pending)
+            self._pending.clear()
+            self._replayed = 0
+            self._wakeup.clear()
+            self.position = self._seen
+        return events
+
+
+class EvaluationEventBus:
+    """In-process fan-out of evaluation writes with a monotonic sequence.
+
+    Sequences restart with the process, so each bus carries a random ``epoch``
+    that clients echo back to tell which run their position belongs to.
+    """
+
+    def __init__(self, history_size: int = 1000, subscriber_buffer: int = 256):
+        self.epoch = uuid.uuid4().hex[:12]
+        self._lock = threading.Lock()
+        self._commit_lock = threading.Lock()
+        self._sequence = 0
+        self._history: deque[EvaluationEvent] = deque(maxlen=history_size)
+        self._subscriber_buffer = subscriber_buffer
+        self._subscribers: set[EventSubscription] = set()
+
+    @property
+    def last_sequence(self) -> int:
+        return self._sequence
+
+    @contextmanager
+    def ordered_commit(self) -> Iterator[None]:
+        """Hold around a write's commit and publish so sequence order matches commit order."""
+        with self._commit_lock:
+            yield
+
+    def publish(
+        self,
+        event_type: str,
+        evaluation_id: int,
+        owner_id: str,
+        data: dict[str, Any] | None = None,
+    ) -> EvaluationEvent:
+        with self._lock:
+            self._sequence += 1
+            event = EvaluationEvent(
+                sequence=self._sequence,
+                type=event_type,
+                evaluation_id=evaluation_id,
+                owner_id=owner_id,
+                data=data,
+            )
+            self._history.append(event)
+            for subscription in self._subscribers:
+                subscription._push(event)
+        return event
+
+    def subscribe(
+        self,
+        after: int | None = None,
+        epoch: str | None = None,
+        visible: Callable[[EvaluationEvent], bool] | None = None,
+    ) -> EventSubscription:
+        """Register a subscriber, replaying buffered events newer than ``after``.
+
+        Replay and registration happen under the same lock so no event is lost
+        between the two. If ``after`` can no longer be served from history (it
+        fell out of the buffer or comes from another ``epoch``) the
+        subscription starts out overflowed and the caller should ask the
+        client to resync.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            position = self._sequence if after is None else after
+            subscription = EventSubscription(loop, self._subscriber_buffer, position, visible)
+            if epoch is not None and epoch != self.epoch:
+                subscription.overflowed = True
+            elif after is not None:
+                oldest = self._history[0].sequence if self._history else self._sequence + 1
+                if after > self._sequence or after < oldest - 1:
+                    subscription.overflowed = True
+                else:
+                    for event in self._history:
+                        if event.sequence > after:
+                            subscription._push(event, replay=True)
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: EventSubscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+
+@lru_cache
+def get_event_bus() -> EvaluationEventBus:
+    settings = get_settings()
+    return EvaluationEventBus(
+        history_size=settings.change_feed_history_size,
+        subscriber_buffer=settings.change_feed_subscriber_buffer,
+    )
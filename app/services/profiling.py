@@ -0,0 +1,381 @@
+import asyncio
+import cProfile
+import inspect
+import io
+import pstats
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import lru_cache, wraps
+
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+
+from app.config import Settings, get_settings
+from app.database import engine
+from app.services.tokens import is_admin_token
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_ID_HEADER = b"x-profile-id"
+# Never sampled, so reading profiles doesn't evict them.
+UNSAMPLED_PATH_PREFIX = "/admin/"
+
+# Before 3.12 cProfile hooks only the calling thread. From 3.12 it uses
+# sys.monitoring, which traces every thread and allows one profiler at a time.
+THREAD_LOCAL_PROFILER = sys.version_info < (3, 12)
+
+_current_profile: ContextVar["RequestProfile | None"] = ContextVar("current_profile", default=None)
+_profiler_lock = threading.Lock()
+_sql_listeners_installed = False
+
+
+@dataclass
+class StatementTiming:
+    statement: str
+    duration_ms: float
+
+
+@dataclass
+class RequestProfile:
+    id: str
+    method: str
+    path: str
+    trigger: str
+    started_at: datetime
+    status_code: int | None = None
+    duration_ms: float = 0.0
+    serialization_ms: float = 0.0
+    truncated: bool = False
+    finished: bool = False
+    capture_stack: bool = True
+    stats: str = ""
+    statements: list[StatementTiming] = field(default_factory=list)
+    profilers: list[cProfile.Profile] = field(default_factory=list)
+    endpoint_finished_at: float | None = None
+
+    @property
+    def db_time_ms(self) -> float:
+        return sum(statement.duration_ms for statement in self.statements)
+
+    @property
+    def db_statement_count(self) -> int:
+        return len(self.statements)
+
+
+class ProfileStore:
+    """Bounded in-memory store of finished profiles, newest last."""
+
+    def __init__(self, max_size: int = 50):
+        self._lock = threading.Lock()
+        self._max_size = max_size
+        self._profiles: OrderedDict[str, RequestProfile] = OrderedDict()
+
+    def add(self, profile: RequestProfile) -> None:
+        with self._lock:
+            self._profiles[profile.id] = profile
+            while len(self._profiles) > self._max_size:
+                self._profiles.popitem(last=False)
+
+    def get(self, profile_id: str) -> RequestProfile | None:
+        with self._lock:
+            return self._profiles.get(profile_id)
+
+    def list(self) -> list[RequestProfile]:
+        with self._lock:
+            return list(reversed(self._profiles.values()))
+
+
+@lru_cache
+def get_profile_store() -> ProfileStore:
+    return ProfileStore(max_size=get_settings().profiling_store_size)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the execution context, which is discarded even when the statement fails.
+    if context is not None and _current_profile.get() is not None:
+        context._profile_query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current_profile.get()
+    started = getattr(context, "_profile_query_start", None)
+    if profile is None or profile.finished or started is None:
+        return
+    elapsed = (time.perf_counter() - started) * 1000
+    profile.statements.append(StatementTiming(statement=statement, duration_ms=elapsed))
+
+
+def _install_sql_listeners() -> None:
+    # Registered on first use so deployments that never profile pay nothing.
+    global _sql_listeners_installed
+    if _sql_listeners_installed:
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    _sql_listeners_installed = True
+
+
+def _summarize_stats(profile: RequestProfile, limit: int) -> str:
+    stream = io.StringIO()
+    stats = pstats.Stats(stream=stream)
+    for profiler in profile.profilers:
+        try:
+            stats.add(profiler)
+        except TypeError:
+            # pstats refuses profilers that recorded nothing.
+            continue
+    if not stats.stats:
+        return ""
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(limit)
+    return stream.getvalue()
+
+
+def _enable(profiler: cProfile.Profile) -> bool:
+    try:
+        profiler.enable()
+    except ValueError:
+        # Another profiler owns sys.monitoring (3.12+); keep timings only.
+        return False
+    return True
+
+
+class _ProfiledAwaitable:
+    """Drive a coroutine with the profiler on only while the coroutine runs.
+
+    The profiler is off across every suspension, so other tasks on the event
+    loop are never traced.
+    """
+
+    def __init__(self, coroutine, profiler: cProfile.Profile):
+        self._coroutine = coroutine
+        self._profiler = profiler
+
+    def __await__(self):
+        value, error = None, None
+        while True:
+            enabled = _enable(self._profiler)
+            try:
+                if error is not None:
+                    yielded = self._coroutine.throw(error)
+                else:
+                    yielded = self._coroutine.send(value)
+            except StopIteration as stop:
+                return stop.value
+            finally:
+                if enabled:
+                    self._profiler.disable()
+            try:
+                value, error = (yield yielded), None
+            except BaseException as exc:
+                value, error = None, exc
+
+
+def _active_profile() -> RequestProfile | None:
+    profile = _current_profile.get()
+    if profile is None or profile.finished:
+        return None
+    return profile
+
+
+def _run_sync(call, is_endpoint: bool, args, kwargs):
+    # Sync calls run in the threadpool; the copied context tells us this call
+    # belongs to the profiled request.
+    profile = _active_profile()
+    if profile is None:
+        return call(*args, **kwargs)
+    profiler = cProfile.Profile() if profile.capture_stack else None
+    enabled = profiler is not None and _enable(profiler)
+    try:
+        return call(*args, **kwargs)
+    finally:
+        if enabled:
+            profiler.disable()
+            if not profile.finished:
+                profile.profilers.append(profiler)
+        if is_endpoint:
+            profile.endpoint_finished_at = time.perf_counter()
+
+
+async def _run_async(call, is_endpoint: bool, args, kwargs):
+    profile = _active_profile()
+    if profile is None:
+        return await call(*args, **kwargs)
+    try:
+        if not profile.capture_stack:
+            return await call(*args, **kwargs)
+        profiler = cProfile.Profile()
+        profile.profilers.append(profiler)
+        return await _ProfiledAwaitable(call(*args, **kwargs), profiler)
+    finally:
+        if is_endpoint:
+            profile.endpoint_finished_at = time.perf_counter()
+
+
+def _profiled_endpoint(call):
+    if asyncio.iscoroutinefunction(call):
+
+        @wraps(call)
+        async def run(*args, **kwargs):
+            return await _run_async(call, True, args, kwargs)
+
+        return run
+
+    @wraps(call)
+    def run_sync(*args, **kwargs):
+        return _run_sync(call, True, args, kwargs)
+
+    return run_sync
+
+
+class _ProfiledDependency:
+    # Compares and hashes like the wrapped function so dependency_overrides
+    # keyed by the original still match.
+
+    def __init__(self, call):
+        self.call = call
+
+    def __eq__(self, other):
+        return other is self or other == self.call
+
+    def __hash__(self):
+        return hash(self.call)
+
+
+class _ProfiledSyncDependency(_ProfiledDependency):
+    def __call__(self, *args, **kwargs):
+        return _run_sync(self.call, False, args, kwargs)
+
+
+class _ProfiledAsyncDependency(_ProfiledDependency):
+    async def __call__(self, *args, **kwargs):
+        return await _run_async(self.call, False, args, kwargs)
+
+
+def _wrap_dependencies(dependant) -> None:
+    for sub_dependant in dependant.dependencies:
+        _wrap_dependencies(sub_dependant)
+        call = sub_dependant.call
+        # Generator dependencies, classes and callable instances are left alone.
+        if not inspect.isfunction(call) or inspect.isgeneratorfunction(call) or inspect.isasyncgenfunction(call):
+            continue
+        if asyncio.iscoroutinefunction(call):
+            sub_dependant.call = _ProfiledAsyncDependency(call)
+        else:
+            sub_dependant.call = _ProfiledSyncDependency(call)
+
+
+class ProfiledRoute(APIRoute):
+    """Route class whose endpoint and dependency calls feed the active profile.
+
+    Only these calls are profiled, each in the thread that runs it, so the
+    stats hold this request's work and nothing else.
+    """
+
+    def get_route_handler(self):
+        _wrap_dependencies(self.dependant)
+        self.dependant.call = _profiled_endpoint(self.dependant.call)
+        return super().get_route_handler()
+
+
+class ProfilingMiddleware:
+    """Profile individual requests on demand.
+
+    A request is profiled when it carries ``X-Profile`` with a valid admin
+    token, or when a request outside ``/admin/`` that sends an
+    ``Authorization`` header (not verified here) is picked by
+    ``profiling_sample_rate``. Call stacks come from ``ProfiledRoute``, which
+    runs cProfile only around this request's endpoint and dependency calls.
+    On Python 3.12+ cProfile traces every thread, so sampled requests record
+    timings without stacks there. Serialization time runs from the endpoint
+    returning to the response starting. Only one request is profiled at a
+    time; others run untouched. A profile ends when the response starts, or
+    after ``profiling_max_seconds`` (marked ``truncated``), so streams and
+    long polls cannot hold it open. Finished profiles are kept in memory;
+    header-triggered responses carry ``X-Profile-Id`` so the admin can fetch
+    theirs.
+    """
+
+    def __init__(self, app, settings: Settings | None = None):
+        self.app = app
+        self.settings = settings or get_settings()
+
+    async def __call__(self, scope, receive, send):
+        trigger = self._trigger(scope) if scope["type"] == "http" else None
+        if trigger is None or not _profiler_lock.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+        await self._profile(scope, receive, send, trigger)
+
+    def _trigger(self, scope) -> str | None:
+        if any(name == PROFILE_HEADER for name, _ in scope["headers"]):
+            headers = dict(scope["headers"])
+            scheme, _, token = headers.get(b"authorization", b"").decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer" and token and is_admin_token(token, self.settings):
+                return "header"
+            return None
+        rate = self.settings.profiling_sample_rate
+        if (
+            rate > 0
+            and random.random() < rate
+            and not scope["path"].startswith(UNSAMPLED_PATH_PREFIX)
+            and any(name == b"authorization" for name, _ in scope["headers"])
+        ):
+            return "sampled"
+        return None
+
+    async def _profile(self, scope, receive, send, trigger: str) -> None:
+        _install_sql_listeners()
+        profile = RequestProfile(
+            id=uuid.uuid4().hex,
+            method=scope["method"],
+            path=scope["path"],
+            trigger=trigger,
+            started_at=datetime.now(timezone.utc),
+            capture_stack=trigger == "header" or THREAD_LOCAL_PROFILER,
+        )
+
+        started = time.perf_counter()
+
+        def finish(truncated: bool = False) -> None:
+            if profile.finished:
+                return
+            profile.finished = True
+            profile.truncated = truncated
+            now = time.perf_counter()
+            profile.duration_ms = (now - started) * 1000
+            if profile.endpoint_finished_at is not None and not truncated:
+                profile.serialization_ms = (now - profile.endpoint_finished_at) * 1000
+            try:
+                profile.stats = _summarize_stats(profile, self.settings.profiling_stats_limit)
+                get_profile_store().add(profile)
+            finally:
+                profile.profilers.clear()
+                _profiler_lock.release()
+
+        async def send_with_profile_id(message):
+            if message["type"] == "http.response.start":
+                profile.status_code = message["status"]
+                if trigger == "header":
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (PROFILE_ID_HEADER, profile.id.encode())
+                    ]
+                # Response bodies (SSE streams included) are not profiled.
+                finish()
+            await send(message)
+
+        timer = asyncio.get_running_loop().call_later(
+            self.settings.profiling_max_seconds, finish, True
+        )
+        token = _current_profile.set(profile)
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            timer.cancel()
+            finish()
+            _current_profile.reset(token)